@@ -2,36 +2,53 @@ import argparse
 import sys
 import os
 import hashlib
-from itertools import cycle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import qrcode
 
 
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+# Размер данных в байтах, начиная с которого xor_cipher использует NumPy.
+XOR_INT_THRESHOLD = 512
+
+
 def get_hash(file_path):
     """
     Вычисляет SHA-256 хеш файла для проверки целостности.
 
-    Считывает файл блоками по 4096 байт, чтобы не нагружать оперативную
-    память при работе с большими изображениями.
+    На Python 3.11+ использует hashlib.file_digest, который читает файл
+    в цикле на C. В старых версиях файл считывается блоками по 1 МиБ,
+    чтобы не нагружать оперативную память при работе с большими изображениями.
 
     Args:
         file_path (str): Путь к файлу, хеш которого нужно получить.
 
     Returns:
-        sha256 (str): Хеш-сумма файла в шестнадцатеричном формате.
+        str: Хеш-сумма файла в шестнадцатеричном формате.
     """
-    sha256_hash = hashlib.sha256()
     with open(file_path, 'rb') as f:
-        for byte_block in iter(lambda: f.read(4096), b''):
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        sha256_hash = hashlib.sha256()
+        for byte_block in iter(lambda: f.read(1024 * 1024), b''):
             sha256_hash.update(byte_block)
-            sha256 = sha256_hash.hexdigest()
-    return sha256
+    return sha256_hash.hexdigest()
 
 
 def xor_cipher(data, password):
     """
     Шифрует или дешифрует байты с помощью операции XOR.
 
+    Ключ заранее размножается до длины данных, после чего XOR выполняется
+    одной векторной операцией NumPy вместо побайтового цикла. Ключи длиной
+    1, 2, 4 или 8 байт обрабатываются словами: данные рассматриваются как
+    массив целых той же ширины и XOR-ятся с одним скалярным значением.
+    Короткие данные (типичные секретные сообщения) XOR-ятся как одно
+    большое целое число: для них накладные расходы NumPy больше самой работы.
+
     Args:
         data (bytes): Входные данные (байтовая строка).
         password (str): Пароль для шифрования/дешифрования.
@@ -42,49 +59,54 @@ def xor_cipher(data, password):
     if not password:
         return data
     key = password.encode('utf-8')
-    return bytes([a ^ b for a, b in zip(data, cycle(key))])
+    if len(data) >= XOR_INT_THRESHOLD and len(key) in (1, 2, 4, 8):
+        word = np.dtype('u%d' % len(key))
+        pad = -len(data) % len(key)
+        a = np.frombuffer(bytes(data) + b'\0' * pad, dtype=word)
+        k = np.frombuffer(key, dtype=word)[0]
+        return np.bitwise_xor(a, k).tobytes()[:len(data)]
+
+    key_buf = (key * (len(data) // len(key) + 1))[:len(data)]
+    if len(data) < XOR_INT_THRESHOLD:
+        value = (int.from_bytes(data, 'little')
+                 ^ int.from_bytes(key_buf, 'little'))
+        return value.to_bytes(len(data), 'little')
+    a = np.frombuffer(data, dtype=np.uint8)
+    k = np.frombuffer(key_buf, dtype=np.uint8)
+    return np.bitwise_xor(a, k).tobytes()
 
 
 def bytes_to_bits(data):
     """
-    Преобразует последовательность байтов в список битов.
+    Преобразует последовательность байтов в массив битов.
 
-    Каждый байт преобразуется в 8 битов (0 или 1).
+    Каждый байт преобразуется в 8 битов (0 или 1), старший бит первым.
 
     Args:
         data (bytes): Входные байтовые данные.
 
     Returns:
-        list: Список целых чисел (0 и 1), представляющий биты данных.
+        numpy.ndarray: Массив uint8 из 0 и 1, представляющий биты данных.
     """
-    bits = []
-    for byte in data:
-        bin_val = format(byte, '08b')
-        bits.extend([int(b) for b in bin_val])
-    return bits
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
 
 
 def bits_to_bytes(bits):
     """
-    Собирает список битов обратно в последовательность байтов.
+    Собирает массив битов обратно в последовательность байтов.
 
     Группирует биты по 8 штук и преобразует их в соответствующие
-    байтовые значения.
+    байтовые значения. Неполная последняя группа отбрасывается.
 
     Args:
-        bits (list): Список целых чисел (0 и 1).
+        bits (list | numpy.ndarray): Последовательность целых чисел (0 и 1).
 
     Returns:
         bytes: Восстановленная байтовая строка.
     """
-    byte_values = []
-    for i in range(0, len(bits), 8):
-        byte_chunk = bits[i:i + 8]
-        if len(byte_chunk) < 8:
-            break
-        byte_val = int(''.join(map(str, byte_chunk)), 2)
-        byte_values.append(byte_val)
-    return bytes(byte_values)
+    bits = np.asarray(bits, dtype=np.uint8)
+    n = bits.size - bits.size % 8
+    return np.packbits(bits[:n]).tobytes()
 
 
 def get_files_list(input_path, output_path):
@@ -106,15 +128,105 @@ def get_files_list(input_path, output_path):
         if not os.path.exists(output_path):
             os.makedirs(output_path)
             print('Создана папка: ' + output_path)
-        for filename in os.listdir(input_path):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                tasks.append((os.path.join(input_path, filename),
-                              os.path.join(output_path, filename)))
+        with os.scandir(input_path) as it:
+            tasks = [(entry.path, os.path.join(output_path, entry.name))
+                     for entry in it
+                     if entry.is_file()
+                     and entry.name.lower().endswith(IMAGE_EXTENSIONS)]
     else:
         tasks.append((input_path, output_path))
     return tasks
 
 
+@lru_cache(maxsize=8)
+def _get_font(name, size):
+    """
+    Загружает шрифт TrueType и кеширует его.
+
+    При пакетной обработке шрифт читается с диска один раз, а не для
+    каждого файла. Если шрифт не найден, используется стандартный.
+
+    Args:
+        name (str): Имя или путь к файлу шрифта.
+        size (int): Размер шрифта.
+
+    Returns:
+        ImageFont.FreeTypeFont | ImageFont.ImageFont: Загруженный шрифт.
+    """
+    try:
+        return ImageFont.truetype(name, size)
+    except IOError:
+        return ImageFont.load_default()
+
+
+def _prepare_base(img, is_jpeg):
+    """
+    Приводит исходное изображение к режиму, в котором на него накладывается
+    водяной знак.
+
+    Для JPEG из изображения без прозрачности сразу используется RGB:
+    лишнее преобразование в RGBA и обратно не нужно. Если прозрачность
+    есть, наложение идёт в RGBA, чтобы цвета совпадали с PNG-результатом.
+
+    Args:
+        img (Image.Image): Исходное изображение.
+        is_jpeg (bool): Будет ли результат сохранён в JPEG.
+
+    Returns:
+        Image.Image: Изображение в режиме RGB или RGBA.
+    """
+    has_alpha = 'A' in img.getbands() or 'transparency' in img.info
+    mode = 'RGB' if is_jpeg and not has_alpha else 'RGBA'
+    if img.mode != mode:
+        img = img.convert(mode)
+    return img
+
+
+def _overlay(base, layer, x, y):
+    """
+    Накладывает полупрозрачный слой на часть изображения.
+
+    Изменяется только область под слоем; части слоя за границами
+    изображения отбрасываются.
+
+    Args:
+        base (Image.Image): Изображение в режиме RGB или RGBA (изменяется на месте).
+        layer (Image.Image): Накладываемый слой в режиме RGBA.
+        x (int): Координата X верхнего левого угла слоя.
+        y (int): Координата Y верхнего левого угла слоя.
+    """
+    left, top = max(x, 0), max(y, 0)
+    right = min(x + layer.width, base.width)
+    bottom = min(y + layer.height, base.height)
+    if right <= left or bottom <= top:
+        return
+    layer = layer.crop((left - x, top - y, right - x, bottom - y))
+    if base.mode == 'RGBA':
+        base.alpha_composite(layer, (left, top))
+    else:
+        base.paste(layer, (left, top), layer)
+
+
+def _save_overlay_image(img, output_path, is_jpeg):
+    """
+    Сохраняет изображение с водяным знаком.
+
+    JPEG сохраняется с качеством 85 и субдискретизацией 4:2:0.
+    После записи кеш декодированных изображений сбрасывается.
+
+    Args:
+        img (Image.Image): Изображение для сохранения.
+        output_path (str): Путь для сохранения.
+        is_jpeg (bool): Сохранять ли в JPEG.
+    """
+    if is_jpeg:
+        _ensure_rgb(img).save(output_path, quality=85, subsampling=2)
+    else:
+        img.save(output_path)
+    # Файл мог быть перезаписан быстрее, чем меняется его mtime.
+    _load_lsb_prefix_cached.cache_clear()
+
+
 def add_watermark(input_path, output_path, text, x, y, opacity):
     """
     Добавляет текстовый водяной знак на изображение.
@@ -135,21 +247,25 @@ def add_watermark(input_path, output_path, text, x, y, opacity):
     if not (0 <= opacity <= 255):
         raise ValueError('Прозрачность должна быть от 0 до 255')
 
-    with Image.open(input_path).convert('RGBA') as base:
-        txt_layer = Image.new('RGBA', base.size, (255, 255, 255, 0))
-        draw = ImageDraw.Draw(txt_layer)
-        try:
-            font = ImageFont.truetype('arial.ttf', 40)
-        except IOError:
-            font = ImageFont.load_default()
+    is_jpeg = output_path.lower().endswith(JPEG_EXTENSIONS)
+    with Image.open(input_path) as img:
+        base = _prepare_base(img, is_jpeg)
+        font = _get_font('arial.ttf', 40)
 
-        draw.text((x, y), text, font=font, fill=(255, 255, 255, opacity))
-        out = Image.alpha_composite(base, txt_layer)
+        # Текст рисуется на слое размером с его рамку, а не со всё
+        # изображение, и накладывается только на эту область.
+        left, top, right, bottom = ImageDraw.Draw(base).textbbox(
+            (x, y), text, font=font)
+        if right > left and bottom > top:
+            txt_layer = Image.new('RGBA', (right - left, bottom - top),
+                                  (255, 255, 255, 0))
+            draw = ImageDraw.Draw(txt_layer)
+            draw.text((x - left, y - top), text, font=font,
+                      fill=(255, 255, 255, opacity))
+            _overlay(base, txt_layer, left, top)
 
-        if output_path.lower().endswith(('.jpg', '.jpeg')):
-            out = out.convert('RGB')
-        out.save(output_path)
-        print('Текст добавлен, файл сохранён в: ' + output_path)
+        _save_overlay_image(base, output_path, is_jpeg)
+        print('Текст добавлен, файл сохранён в: ' + output_path + '\n', end='')
 
 
 def add_qr(input_path, output_path, data, x, y, opacity, color='black'):
@@ -176,40 +292,158 @@ def add_qr(input_path, output_path, data, x, y, opacity, color='black'):
         raise ValueError('Прозрачность должна быть от 0 до 255')
 
     qr_img = qrcode.make(data).convert('RGBA')
-    pixels = qr_img.getdata()
-    new_pixels = []
-
-    for r, g, b, a in pixels:
-        if r > 200:
-            new_pixels.append((255, 255, 255, 0))
-        else:
-            if color == 'white':
-                new_pixels.append((255, 255, 255, opacity))
-            else:
-                new_pixels.append((0, 0, 0, opacity))
-
-    qr_img.putdata(new_pixels)
+    a = np.array(qr_img)
+    mask = a[:, :, 0] > 200
+    out = np.empty_like(a)
+    out[mask] = (255, 255, 255, 0)
+    if color == 'white':
+        out[~mask] = (255, 255, 255, opacity)
+    else:
+        out[~mask] = (0, 0, 0, opacity)
+    qr_img = Image.fromarray(out)
 
-    with Image.open(input_path).convert('RGBA') as base:
+    is_jpeg = output_path.lower().endswith(JPEG_EXTENSIONS)
+    with Image.open(input_path) as img:
+        base = _prepare_base(img, is_jpeg)
         if qr_img.width > base.width:
             scale = base.width // 4
             qr_img = qr_img.resize((scale, scale))
 
-        layer = Image.new('RGBA', base.size, (0, 0, 0, 0))
-        layer.paste(qr_img, (x, y))
-        out = Image.alpha_composite(base, layer)
+        _overlay(base, qr_img, x, y)
+
+        _save_overlay_image(base, output_path, is_jpeg)
+        print('QR-код добавлен, файл сохранён в: ' + output_path + '\n', end='')
+
+
+def _ensure_rgb(img):
+    """
+    Приводит изображение к режиму RGB.
+
+    Если изображение уже в RGB, возвращается как есть, без создания копии.
+
+    Args:
+        img (Image.Image): Исходное изображение.
 
-        if output_path.lower().endswith(('.jpg', '.jpeg')):
-            out = out.convert('RGB')
-        out.save(output_path)
-        print('QR-код добавлен, файл сохранён в: ' + output_path)
+    Returns:
+        Image.Image: Изображение в режиме RGB.
+    """
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img
 
 
-def stego_hide(input_path, output_path, secret_text, password=''):
+@lru_cache(maxsize=4)
+def _load_lsb_prefix_cached(path, mtime_ns, size, max_bits):
+    """
+    Декодирует начальные строки изображения в массив RGB и кеширует результат.
+
+    В массив копируются и приводятся к RGB только строки, которые могут
+    содержать max_bits скрытых битов, поэтому записи кеша небольшие.
+    Время изменения и размер файла входят в ключ кеша, поэтому
+    изменённый файл декодируется заново.
+
+    Args:
+        path (str): Путь к изображению.
+        mtime_ns (int): Время изменения файла в наносекундах.
+        size (int): Размер файла в байтах.
+        max_bits (int): Максимальное количество считываемых битов.
+
+    Returns:
+        numpy.ndarray: Массив uint8 формы (строки, ширина, 3), только для чтения.
+    """
+    with Image.open(path) as img:
+        rows = min(img.height, -(-max_bits // img.width))
+        prefix = _ensure_rgb(img.crop((0, 0, img.width, rows)))
+        arr = np.array(prefix, dtype=np.uint8)
+    arr.flags.writeable = False
+    return arr
+
+
+def _load_lsb_prefix(path, max_bits):
+    """
+    Возвращает начальные строки изображения из кеша или с диска.
+
+    Повторные попытки извлечения из того же файла (например, с разными
+    паролями в интерактивном режиме) не декодируют его заново.
+
+    Args:
+        path (str): Путь к изображению.
+        max_bits (int): Максимальное количество считываемых битов.
+
+    Returns:
+        numpy.ndarray: Массив uint8 формы (строки, ширина, 3), только для чтения.
+    """
+    st = os.stat(path)
+    return _load_lsb_prefix_cached(os.path.abspath(path), st.st_mtime_ns,
+                                   st.st_size, max_bits)
+
+
+def _embed_bits(arr, bits):
+    """
+    Записывает биты в младшие биты синего канала массива пикселей.
+
+    Биты записываются в пиксели по порядку строк, слева направо.
+    Массив изменяется на месте и должен быть C-непрерывным: иначе
+    arr.reshape(-1) вернёт копию, и запись в неё потеряется.
+
+    Args:
+        arr (numpy.ndarray): C-непрерывный массив uint8 формы (высота, ширина, 3).
+        bits (numpy.ndarray): Массив битов (0 и 1) для записи.
+    """
+    # Синий канал как представление плоского массива: запись идёт прямо в arr.
+    # Обработка по 8 пикселей через uint64 здесь не быстрее: синий канал
+    # лежит с шагом 3 байта, и сбор его в непрерывный буфер и обратно
+    # стоит больше, чем сама побитовая операция.
+    assert arr.flags.c_contiguous, 'arr должен быть C-непрерывным'
+    blue = arr.reshape(-1)[2::3]
+    n = bits.size
+    blue[:n] = (blue[:n] & 0xFE) | bits
+
+
+def _extract_bits(arr, max_bits):
+    """
+    Считывает младшие биты синего канала массива пикселей.
+
+    Args:
+        arr (numpy.ndarray): Массив uint8 формы (высота, ширина, 3).
+        max_bits (int): Максимальное количество считываемых битов.
+
+    Returns:
+        numpy.ndarray: Массив битов (0 и 1) в порядке обхода пикселей.
+    """
+    return arr.reshape(-1)[2:max_bits * 3:3] & 1
+
+
+def _save_lsb_image(img, output_path, fast=False):
+    """
+    Сохраняет изображение после изменения младших битов.
+
+    По умолчанию PNG сохраняется со стандартным сжатием Pillow (уровень 6).
+    В быстром режиме используется уровень 1: сохранение в несколько раз
+    быстрее, а файл немного больше, так как шум в младших битах
+    всё равно плохо сжимается.
+
+    После записи кеш декодированных изображений сбрасывается.
+
+    Args:
+        img (Image.Image): Изображение для сохранения.
+        output_path (str): Путь для сохранения.
+        fast (bool): Использовать быстрое сжатие для PNG.
+    """
+    if fast and output_path.lower().endswith('.png'):
+        img.save(output_path, compress_level=1)
+    else:
+        img.save(output_path)
+    # Файл мог быть перезаписан быстрее, чем меняется его mtime.
+    _load_lsb_prefix_cached.cache_clear()
+
+
+def stego_hide(input_path, output_path, secret_text, password='', fast=False):
     """
     Скрывает текстовое сообщение в изображении методом LSB.
 
-    Данные внедряются в младшие биты синего канала пикселей.
+    Данные внедряются в младшие биты синего канала пикселей (построчно,
+    слева направо). Запись выполняется одной векторной операцией NumPy.
     Поддерживает опциональное шифрование XOR перед внедрением.
 
     Args:
@@ -217,6 +451,7 @@ def stego_hide(input_path, output_path, secret_text, password=''):
         output_path (str): Путь для сохранения изображения со скрытыми данными.
         secret_text (str): Текст, который нужно скрыть.
         password (str): Пароль для шифрования (опционально).
+        fast (bool): Сохранять PNG с быстрым сжатием (см. _save_lsb_image).
 
     Raises:
         ValueError: Если объем данных превышает емкость изображения.
@@ -226,26 +461,18 @@ def stego_hide(input_path, output_path, secret_text, password=''):
         data_bytes = xor_cipher(data_bytes, password)
 
     full_payload = data_bytes + b'$STOP$'
-    bits = bytes_to_bits(full_payload)
-
-    img = Image.open(input_path).convert('RGB')
-    pixels = img.load()
-    width, height = img.size
-    idx = 0
-
-    if len(bits) > width * height:
-        raise ValueError('Слишком большие данные для этого изображения.')
-
-    for y in range(height):
-        for x in range(width):
-            if idx < len(bits):
-                r, g, b = pixels[x, y]
-                new_b = (b & ~1) | bits[idx]
-                pixels[x, y] = (r, g, new_b)
-                idx += 1
-            else:
-                break
-    img.save(output_path)
+
+    # Image.open читает только заголовок, поэтому ёмкость проверяется
+    # до декодирования пикселей и разложения данных на биты.
+    with Image.open(input_path) as img:
+        width, height = img.size
+        if len(full_payload) * 8 > width * height:
+            raise ValueError('Слишком большие данные для этого изображения.')
+
+        bits = bytes_to_bits(full_payload)
+        arr = np.array(_ensure_rgb(img), dtype=np.uint8)
+    _embed_bits(arr, bits)
+    _save_lsb_image(Image.fromarray(arr), output_path, fast)
     print('Данные спрятаны, файл сохранён в: ' + output_path)
 
 
@@ -263,26 +490,10 @@ def stego_extract(input_path, password=''):
     Returns:
         str: Извлеченное сообщение или описание ошибки.
     """
-    img = Image.open(input_path).convert('RGB')
-    pixels = img.load()
-    width, height = img.size
-
-    extracted_bits = []
     max_bytes = 4096
     max_bits = max_bytes * 8
-    bits_count = 0
-
-    for y in range(height):
-        if bits_count >= max_bits:
-            break
-        for x in range(width):
-            if bits_count >= max_bits:
-                break
-            r, g, b = pixels[x, y]
-            extracted_bits.append(b & 1)
-            bits_count += 1
-
-    raw_data = bits_to_bytes(extracted_bits)
+    arr = _load_lsb_prefix(input_path, max_bits)
+    raw_data = bits_to_bytes(_extract_bits(arr, max_bits))
     stop_marker = b'$STOP$'
 
     if stop_marker in raw_data:
@@ -297,7 +508,7 @@ def stego_extract(input_path, password=''):
         return 'Не найдено скрытых данных.'
 
 
-def clean_lsb(input_path, output_path):
+def clean_lsb(input_path, output_path, fast=False):
     """
     Очищает изображение от скрытых LSB данных.
 
@@ -306,18 +517,33 @@ def clean_lsb(input_path, output_path):
     Args:
         input_path (str): Путь к исходному изображению.
         output_path (str): Путь для сохранения очищенного изображения.
+        fast (bool): Сохранять PNG с быстрым сжатием (см. _save_lsb_image).
     """
-    img = Image.open(input_path).convert('RGB')
-    pixels = img.load()
-    width, height = img.size
+    with Image.open(input_path) as img:
+        arr = np.array(_ensure_rgb(img))
+    arr[:, :, 2] &= np.uint8(0xFE)
+    _save_lsb_image(Image.fromarray(arr), output_path, fast)
+    print('LSB-данные очищены, файл сохранён в: ' + output_path)
 
-    for y in range(height):
-        for x in range(width):
-            r, g, b = pixels[x, y]
-            pixels[x, y] = (r, g, b & ~1)
 
-    img.save(output_path)
-    print('LSB-данные очищены, файл сохранён в: ' + output_path)
+def _process_task(func, task):
+    """
+    Обрабатывает один файл из пакетного задания.
+
+    Вызывается в пуле потоков или процессов, поэтому ошибка в одном
+    файле не прерывает обработку остальных. Сообщения выводятся одной
+    записью вместе с переводом строки, чтобы строки из разных потоков
+    не перемешивались.
+
+    Args:
+        func (callable): Функция обработки вида func(input_path, output_path).
+        task (tuple): Пара (входной_путь, выходной_путь).
+    """
+    in_path, out_path = task
+    try:
+        func(in_path, out_path)
+    except Exception as e:
+        print('Ошибка с файлом {} : {}\n'.format(in_path, e), end='')
 
 
 def interactive_mode():
@@ -444,12 +670,16 @@ def main():
     cmd_clean = subparsers.add_parser('clean', help='Очистить LSB-данные')
     cmd_clean.add_argument('input', help='Путь к файлу или папке')
     cmd_clean.add_argument('output', help='Путь для сохранения результата')
+    cmd_clean.add_argument('--fast', action='store_true',
+                           help='Быстрое сжатие PNG (файл чуть больше)')
 
     cmd_hide = subparsers.add_parser('hide', help='Спрятать данные (LSB)')
     cmd_hide.add_argument('input', help='Исходный файл')
     cmd_hide.add_argument('output', help='Файл с секретом')
     cmd_hide.add_argument('--secret', required=True, help='Секретное сообщение')
     cmd_hide.add_argument('--password', default='', help='Пароль (необязательно)')
+    cmd_hide.add_argument('--fast', action='store_true',
+                          help='Быстрое сжатие PNG (файл чуть больше)')
 
     cmd_extract = subparsers.add_parser('extract', help='Извлечь данные (LSB)')
     cmd_extract.add_argument('input', help='Файл с секретом')
@@ -464,21 +694,38 @@ def main():
         if args.command in ['text', 'qr', 'clean']:
             tasks = get_files_list(args.input, args.output)
 
-            for in_path, out_path in tasks:
-                try:
-                    if args.command == 'text':
-                        add_watermark(in_path, out_path, args.text,
-                                      args.x, args.y, args.opacity)
-                    elif args.command == 'qr':
-                        add_qr(in_path, out_path, args.data,
-                               args.x, args.y, args.opacity, args.color)
-                    elif args.command == 'clean':
-                        clean_lsb(in_path, out_path)
-                except Exception as e:
-                    print('Ошибка с файлом', in_path, ':', e)
+            if args.command == 'text':
+                func = partial(add_watermark, text=args.text, x=args.x,
+                               y=args.y, opacity=args.opacity)
+            elif args.command == 'qr':
+                func = partial(add_qr, data=args.data, x=args.x, y=args.y,
+                               opacity=args.opacity, color=args.color)
+            else:
+                func = partial(clean_lsb, fast=args.fast)
+
+            # Один файл обрабатывается сразу: запуск пула стоит дороже
+            # самой работы.
+            if len(tasks) <= 1:
+                for task in tasks:
+                    _process_task(func, task)
+            else:
+                # Наложение текста и QR почти целиком выполняется в C-коде
+                # Pillow, который отпускает GIL, поэтому потоков достаточно.
+                # Для очистки LSB используются процессы; их число по
+                # умолчанию равно количеству CPU с учётом ограничений ОС.
+                if args.command in ('text', 'qr'):
+                    cpu_count = os.cpu_count() or 1
+                    executor = ThreadPoolExecutor(
+                        max_workers=min(32, cpu_count * 2))
+                else:
+                    executor = ProcessPoolExecutor()
+
+                with executor as ex:
+                    list(ex.map(partial(_process_task, func), tasks))
 
         elif args.command == 'hide':
-            stego_hide(args.input, args.output, args.secret, args.password)
+            stego_hide(args.input, args.output, args.secret, args.password,
+                       args.fast)
 
         elif args.command == 'extract':
             msg = stego_extract(args.input, args.password)
@@ -1,13 +1,21 @@
 import pytest
 import os
+import hashlib
+import sys
+import numpy as np
 from PIL import Image
 
 from main import (
     xor_cipher,
+    bytes_to_bits,
+    bits_to_bytes,
     add_watermark,
     add_qr,
     stego_hide,
-    stego_extract
+    stego_extract,
+    clean_lsb,
+    get_hash,
+    main
 )
 
 
@@ -50,6 +58,45 @@ def test_xor_cipher_no_password():
     assert result == original
 
 
+@pytest.mark.parametrize('password', ['k', 'ab', 'pass', '12345678', 'abc'])
+@pytest.mark.parametrize('size', [1, 50])
+def test_xor_cipher_word_keys(password, size):
+    """
+    Ключи длиной в машинное слово, короткие и длинные данные дают тот же
+    результат, что и побайтовый XOR.
+    """
+    original = b'Secret Data of odd length!' * size
+    key = password.encode('utf-8')
+    expected = bytes(b ^ key[i % len(key)] for i, b in enumerate(original))
+
+    assert xor_cipher(original, password) == expected
+
+
+def test_bits_roundtrip():
+    """
+    Преобразование байтов в биты и обратно не должно терять данные.
+    """
+    data = b'Hello$STOP$'
+    bits = bytes_to_bits(data)
+
+    assert len(bits) == len(data) * 8
+    assert bits_to_bytes(bits) == data
+    assert bits_to_bytes(list(bits) + [1, 0, 1]) == data
+
+
+def test_bits_to_bytes_from_lsb_array():
+    """
+    Сборка байтов из младших битов массива пикселей находит стоп-слово.
+    """
+    payload = b'Hi$STOP$'
+    blue = np.full(len(payload) * 8 + 5, 0xFE, dtype=np.uint8)
+    blue[:len(payload) * 8] |= bytes_to_bits(payload)
+
+    raw = bits_to_bytes(blue & 1)
+
+    assert raw.split(b'$STOP$')[0] == b'Hi'
+
+
 def test_text_watermark_positive(temp_files):
     """
     Проверка, что файл создается.
@@ -77,6 +124,23 @@ def test_qr_watermark_positive(temp_files):
     assert os.path.exists(out_p)
 
 
+def test_watermarks_jpeg_output(temp_files, tmp_path):
+    """
+    Водяные знаки сохраняются в JPEG, если указано такое расширение.
+    """
+    in_p, _ = temp_files
+    text_out = str(tmp_path / 'text.jpg')
+    qr_out = str(tmp_path / 'qr.jpeg')
+
+    add_watermark(in_p, text_out, 'Test', -5, 10, 128)
+    add_qr(in_p, qr_out, 'http://test.com', 10, 10, 200, 'white')
+
+    for path in (text_out, qr_out):
+        with Image.open(path) as img:
+            assert img.format == 'JPEG'
+            assert img.mode == 'RGB'
+
+
 def test_qr_watermark_negative_opacity(temp_files):
     """
     Проверка ошибки при отрицательной прозрачности.
@@ -106,3 +170,86 @@ def test_steganography_negative_capacity(temp_files):
 
     with pytest.raises(ValueError):
         stego_hide(in_p, out_p, huge_text)
+
+
+def test_clean_lsb_removes_secret(temp_files):
+    """
+    После очистки LSB скрытое сообщение не должно извлекаться.
+    """
+    in_p, out_p = temp_files
+    stego_hide(in_p, out_p, 'Secret')
+    clean_lsb(out_p, out_p)
+
+    assert stego_extract(out_p) == 'Не найдено скрытых данных.'
+
+
+def test_get_hash_matches_sha256(temp_files):
+    """
+    Хеш файла должен совпадать с SHA-256 его содержимого.
+    """
+    in_p, _ = temp_files
+    with open(in_p, 'rb') as f:
+        expected = hashlib.sha256(f.read()).hexdigest()
+
+    assert get_hash(in_p) == expected
+
+
+def test_steganography_overwrite_output(temp_files):
+    """
+    После перезаписи файла извлекается новое сообщение, а не закешированное.
+    """
+    in_p, out_p = temp_files
+    stego_hide(in_p, out_p, 'first')
+    assert stego_extract(out_p) == 'first'
+
+    stego_hide(in_p, out_p, 'second')
+    assert stego_extract(out_p) == 'second'
+
+
+def test_steganography_fast_roundtrip(temp_files):
+    """
+    Сообщение, сохранённое с быстрым сжатием PNG, извлекается без потерь.
+    """
+    in_p, out_p = temp_files
+    stego_hide(in_p, out_p, 'x', fast=True)
+
+    assert stego_extract(out_p) == 'x'
+
+
+def test_clean_lsb_fast(temp_files):
+    """
+    Очистка с быстрым сжатием PNG тоже удаляет скрытое сообщение.
+    """
+    in_p, out_p = temp_files
+    stego_hide(in_p, out_p, 'Secret')
+    clean_lsb(out_p, out_p, fast=True)
+
+    assert stego_extract(out_p) == 'Не найдено скрытых данных.'
+
+
+def test_cli_fast_flags(temp_files, monkeypatch):
+    """
+    Флаг --fast принимается командами hide и clean.
+    """
+    in_p, out_p = temp_files
+    monkeypatch.setattr(sys, 'argv', ['main.py', 'hide', in_p, out_p,
+                                      '--secret', 'cli', '--fast'])
+    main()
+    assert stego_extract(out_p) == 'cli'
+
+    monkeypatch.setattr(sys, 'argv', ['main.py', 'clean', out_p, out_p,
+                                      '--fast'])
+    main()
+    assert stego_extract(out_p) == 'Не найдено скрытых данных.'
+
+
+def test_watermark_overwrite_invalidates_extract(temp_files):
+    """
+    Водяной знак поверх файла со скрытыми данными сбрасывает кеш извлечения.
+    """
+    in_p, out_p = temp_files
+    stego_hide(in_p, out_p, 'Secret')
+    assert stego_extract(out_p) == 'Secret'
+
+    add_watermark(in_p, out_p, 'Test', 0, 0, 255)
+    assert stego_extract(out_p) == 'Не найдено скрытых данных.'